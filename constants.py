@@ -1,11 +1,16 @@
 """
 A module to keep project constants
 """
+import datetime
 
 # The relative path to the DB file
 DB_PATH = "library.db"
 # The number of days a book is allowed to be borrowed
 ALLOWED_BORROW_DAYS = 30  # type: int
+# The same duration as a timedelta, built once here so that date arithmetic
+# (see Book.return_date in models.py) does not have to construct a new
+# timedelta object on every call.
+ALLOWED_BORROW_TIMEDELTA = datetime.timedelta(days=ALLOWED_BORROW_DAYS)  # type: datetime.timedelta
 
 # This is the Secret Key of the application used to make login
 # secure. As seen in 08_Web_Apps_with_python/Other (end of document)
@@ -6,12 +6,37 @@ import csv
 import datetime
 import os
 
-from peewee import BooleanField, CharField, DateField, ForeignKeyField, Model, SmallIntegerField, SqliteDatabase, FloatField, ManyToManyField
-
-from constants import DB_PATH, ALLOWED_BORROW_DAYS
-
-# The Sqlite DB instance
-db = SqliteDatabase(DB_PATH)  # type: SqliteDatabase
+import bcrypt
+from peewee import BooleanField, CharField, DateField, ForeignKeyField, Model, SmallIntegerField, SqliteDatabase, FloatField, ManyToManyField, chunked
+
+from constants import DB_PATH, ALLOWED_BORROW_TIMEDELTA
+
+# The Sqlite DB instance.
+# The pragmas tune SQLite for a web app that mostly reads and sometimes writes
+# (the defaults are very conservative). Peewee applies them every time a
+# connection is opened.
+# See http://docs.peewee-orm.com/en/latest/peewee/database.html#recommended-settings
+db = SqliteDatabase(
+    DB_PATH,
+    pragmas={
+        # Write-ahead logging lets readers keep reading while a write is in
+        # progress, instead of locking the whole database.
+        "journal_mode": "wal",
+        # With WAL, "normal" only syncs to disk on checkpoints instead of on
+        # every commit, which makes writes (e.g. borrowing a book) much faster
+        # and is still safe against application crashes.
+        "synchronous": "normal",
+        # Use a 64 MB page cache (a negative value means kibibytes).
+        "cache_size": -64000,
+        # Keep temporary tables and indices in memory instead of on disk.
+        "temp_store": "memory",
+        # Let SQLite read the database file through a 256 MB memory map
+        # instead of read() calls.
+        "mmap_size": 268435456,
+        # SQLite does not enforce foreign keys unless asked to.
+        "foreign_keys": 1,
+    },
+)  # type: SqliteDatabase
 
 
 class User(Model):
@@ -20,7 +45,7 @@ class User(Model):
 
     The login is the email.
 
-    The password should be hashed for security reasons but won't be.
+    The password is stored as a salted bcrypt hash, never in clear.
     See https://culttt.com/2013/01/21/why-do-you-need-to-salt-and-hash-passwords/
 
     A user can be an admin or not.
@@ -92,6 +117,13 @@ class Book(Model):
         See http://docs.peewee-orm.com/en/latest/peewee/quickstart.html#model-definition
         """
         database = db
+        # A composite index on (borrowed_by, borrowed_at) so that listing the
+        # books a given user has borrowed (the home page) is answered from the
+        # index instead of scanning the whole book table.
+        # See http://docs.peewee-orm.com/en/latest/peewee/models.html#indexes-and-constraints
+        indexes = (
+            (("borrowed_by", "borrowed_at"), False),
+        )
 
     def return_date(self):
         """
@@ -103,7 +135,7 @@ class Book(Model):
         if not self.borrowed_at:
             return datetime.date.today()
         else:
-            return self.borrowed_at + datetime.timedelta(days=ALLOWED_BORROW_DAYS)
+            return self.borrowed_at + ALLOWED_BORROW_TIMEDELTA
 
 
 def create_tables():
@@ -154,6 +186,9 @@ def recreate_all_tables():
         FOREIGN KEY ("borrowed_by_id") REFERENCES "user" ("id")
     )
 
+    CREATE INDEX IF NOT EXISTS "book_borrowed_by_id_borrowed_at"
+    ON "book" ("borrowed_by_id", "borrowed_at")
+
     CREATE TABLE IF NOT EXISTS "book_author_through" (
         "id" INTEGER NOT NULL PRIMARY KEY,
         "book_id" INTEGER NOT NULL,
@@ -176,11 +211,13 @@ def create_initial_data():
     Given a books.csv file gotten from https://github.com/zygmuntz/goodbooks-10k/blob/master/samples/books.csv,
     fill initial data about books.
     """
+    # Passwords are stored as bcrypt hashes, just like the ones created by the
+    # register page (see server.py).
     User.create(
         email="diaz.ayax@gmail.com",
         first_name="Ayax",
         last_name="Diaz",
-        password="chorizo",
+        password=bcrypt.hashpw(b"chorizo", bcrypt.gensalt()).decode("utf-8"),
         is_admin=True
     )
 
@@ -188,37 +225,91 @@ def create_initial_data():
         email="mustafa.sanli@gmail.com",
         first_name="Mustafa",
         last_name="Sanli",
-        password="1234",
+        password=bcrypt.hashpw(b"1234", bcrypt.gensalt()).decode("utf-8"),
         is_admin=True
     )
 
+    # Make sure the connection is open before we start inserting.
+    # reuse_if_open avoids an error if create_tables already connected.
+    db.connect(reuse_if_open=True)
     # Open the file in read mode. "r" stands for read, "w" for write
     with open('books.csv', mode='r') as csv_file:
         # This DictReader allows to return the data in books.csv as a list of dictionaries
         # where keys are the name of the columns and values are the values for each column in the curent row.
         csv_reader = csv.DictReader(csv_file)
-        for row in csv_reader:
-            # In each row, get rid of unwanted data
-            for book_column in dict(row).keys():
-                # We don't care about all the columns. It's data downloaded from the web, so we will
-                # only use part of it.
-                if book_column not in ["title", "authors", "publication_year", "average_rating", "ratings_count", "image_url"]:
-                    del row[book_column]
-            # First create the authors. Remove it from the row dictionary and make it a list.
-            # In the CSV, authors are separated by a comma followed by a space.
-            authors_list = row.pop("authors").split(", ")
-            authors_data = []
-            # Create all authors, if not already created
-            for author in set(authors_list):
-                # Either create the author, or get an already created author.
-                # See http://docs.peewee-orm.com/en/latest/peewee/querying.html?highlight=get_or_create#create-or-get
-                author, _ = Author.get_or_create(name=author)
-                authors_data.append(author)
-            # Create the book first, and then add the authors. You have to do it this way for a ManyToManyField because
-            # of the intermediary table.
-            book = Book.create(**row)
-            book.authors = authors_data
-            book.save()
+        # Without an explicit transaction, every query below commits
+        # (and syncs to disk) on its own, which makes the initial load very slow.
+        # db.atomic() wraps the whole load in a single transaction, so all the rows
+        # are committed to disk only once at the end.
+        # See http://docs.peewee-orm.com/en/latest/peewee/transactions.html
+        with db.atomic():
+            # Instead of one INSERT per book (plus one UPDATE from book.save()
+            # to fill the intermediary table), we collect everything in Python
+            # lists of plain dictionaries first and insert with insert_many,
+            # which packs many rows into each INSERT statement and does not
+            # need to build a Model instance per row.
+            # See http://docs.peewee-orm.com/en/latest/peewee/querying.html#bulk-inserts
+            books_to_create = []
+            # Remember which author names belong to which book title, so we can
+            # fill the intermediary table once the books are inserted.
+            author_names_by_title = {}
+            # All the distinct author names found in the CSV.
+            all_author_names = set()
+            # The columns of the CSV that map to Book fields. It's data
+            # downloaded from the web, so we will only use part of it.
+            wanted_columns = (
+                "title", "publication_year", "average_rating",
+                "ratings_count", "image_url",
+            )
+            for row in csv_reader:
+                # The authors get their own model, not a Book column.
+                # In the CSV, authors are separated by a comma followed by a space.
+                authors_list = row["authors"].split(", ")
+                author_names_by_title[row["title"]] = set(authors_list)
+                all_author_names.update(authors_list)
+                # Project the row onto the columns we want in one dict
+                # comprehension, instead of copying the full row and deleting
+                # the unwanted columns one by one.
+                books_to_create.append(
+                    {column: row[column] for column in wanted_columns}
+                )
+            for batch in chunked(books_to_create, 500):
+                Book.insert_many(batch).execute()
+            # SQLite does not report the IDs that insert_many generated, so read
+            # them back in one query (the title is unique) to be able to fill
+            # the intermediary table.
+            book_id_by_title = {
+                book.title: book.id for book in Book.select(Book.id, Book.title)
+            }
+            # Create all the authors with a single INSERT instead of one
+            # get_or_create (a SELECT plus maybe an INSERT) per author per row.
+            # The set above already removed the duplicates, so every name is
+            # inserted exactly once.
+            Author.insert_many(
+                [{"name": name} for name in all_author_names]
+            ).execute()
+            # One more SELECT gives us the generated IDs, so looking up an
+            # author while filling the intermediary table is a dictionary
+            # access instead of a query.
+            author_id_by_name = {
+                author.name: author.id
+                for author in Author.select(Author.id, Author.name)
+            }
+            # The intermediary table of the ManyToManyField is a model too, so
+            # it can be bulk-inserted the same way as the books.
+            through_model = Book.authors.get_through_model()
+            through_rows = []
+            for title, author_names in author_names_by_title.items():
+                for name in author_names:
+                    through_rows.append({
+                        "book": book_id_by_title[title],
+                        "author": author_id_by_name[name],
+                    })
+            # Each through row binds two parameters (book_id, author_id), so a
+            # batch of 450 rows stays below SQLite's old limit of 999 bound
+            # parameters per statement.
+            for batch in chunked(through_rows, 450):
+                through_model.insert_many(batch).execute()
 
 
 # This if is True only if this code is executed by calling "python models.py"
@@ -231,6 +322,11 @@ if __name__ == '__main__':
     recreate_all_tables()
     # Create some books, authors and admin users
     create_initial_data()
+    # Gather statistics about the freshly filled tables and indexes, so
+    # SQLite's query planner can pick the best indexes for the joins the
+    # server does (it never collects them on its own).
+    # See https://www.sqlite.org/lang_analyze.html
+    db.execute_sql("ANALYZE")
     # Check if it worked
     # for author in Author.select():
     #     print(author.name)
\ No newline at end of file
@@ -4,20 +4,26 @@ Each function that is decorated with @route('/route') will add a reachable
 URL to the server, for example http://localhost:8080/route.
 """
 # These are imports of standard Python libraries included with python
+import atexit
 import datetime
 import logging
+import socketserver
 import time
+from wsgiref.simple_server import WSGIServer
 
 # These are imports of libraries that need to be installed before running
 # python server.py.
 # The libraries to install are found in requirements.txt
 # You install them by doing "pip install -r requirements.txt"
 # See https://pip.pypa.io/en/stable/reference/pip_install/
-from bottle import route, run, view, request, response, redirect, post, static_file, get, abort
-from peewee import IntegrityError, fn, JOIN
+import bcrypt
+from bottle import route, run, view, request, response, redirect, post, static_file, get, abort, default_app, \
+    HTTPError, SimpleTemplate, TEMPLATE_PATH, TEMPLATES
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from peewee import IntegrityError, prefetch, JOIN
 
 # These are imports of files that are here in the project.
-from models import User, Author, Book
+from models import User, Author, Book, db
 from constants import SECRET_KEY, ALLOWED_BORROW_DAYS
 
 # Create a logger we will use in the whole application to print things
@@ -26,6 +32,13 @@ logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# The serializer that signs and verifies the session cookie. The cookie only
+# contains the user's ID plus a signature and a timestamp, so nothing secret
+# ever travels to the browser, and verifying it back is pure Python (no
+# database query needed until we fetch the user by its primary key).
+# See https://itsdangerous.palletsprojects.com/
+session_serializer = URLSafeTimedSerializer(SECRET_KEY)
+
 # When running on http://localhost:8081 (See run command at the end of this file),
 # the three @route decorators will allow to access this page at URLs:
 # - http://localhost:8081
@@ -77,34 +90,40 @@ def borrow_books():
     # more details.
     user = get_logged_in_user()
 
-    # This query is a bit complex, since we have a ManyToMany relationship (with a get_through_model() which
-    # is just a table with book IDs and Author IDs
-    # For querying, see http://docs.peewee-orm.com/en/latest/peewee/querying.html
-    # SQL:
-    # SELECT id, title, publication_year, average_rating, ratings_count, image_url, borrowed_by_id, borrowed_at, user.id,
-    # GROUP_CONCAT(author.name) AS author_list
-    # FROM book
-    # LEFT OUTER JOIN user ON (borrowed_by_id = user.id)
-    # LEFT OUTER JOIN book_author_through ON (book_author_throug.book_id = id)
-    # INNER JOIN author ON (book_author_trough.author_id = author.id)
-    # GROUP BY id
-    # ORDER BY title
-    books = (
+    # Reading book.authors in the template naively would issue one query per
+    # book to fetch its authors (the classic "N+1 queries" problem). prefetch
+    # solves this in 3 queries total: one for the books, one for the
+    # intermediary table of the ManyToMany relationship, and one for the
+    # authors. Peewee then links the rows together in Python, so iterating
+    # book.authors in the template does not touch the database anymore.
+    # See http://docs.peewee-orm.com/en/latest/peewee/relationships.html#avoiding-the-n-1-problem
+    # The template also reads book.borrowed_by (to show "not available until"
+    # on books other users hold), and without the LEFT OUTER JOIN on User that
+    # access would lazily load the borrower — one extra user query per
+    # borrowed book. Joining User.id into the books query populates
+    # borrowed_by up front; only the ID is selected, the template doesn't
+    # need more.
+    # A single hand-written GROUP_CONCAT query over the three tables would cut
+    # this to one statement, but it returns bare tuples instead of Book
+    # objects; the template calls return_date() on real models, so prefetch
+    # is the better trade here.
+    # The WHERE clause keeps only the books that are not already borrowed by
+    # the current user, because it does not make sense to show a book in a
+    # list of borrowable books if the user already has it. Doing the filter in
+    # SQL means SQLite never ships those rows to Python in the first place.
+    # Careful with NULL: in SQL, "borrowed_by_id != 1" is not true for a NULL
+    # borrowed_by_id (an available book), so the is_null() check is needed too.
+    books = prefetch(
         Book
-        .select(Book, User.id, fn.GROUP_CONCAT(Author.name).alias("author_list"))
+        .select(Book, User.id)
         .join(User, JOIN.LEFT_OUTER)
-        .switch()
-        .join(Book.authors.get_through_model(), JOIN.LEFT_OUTER)
-        .join(Author)
-        .order_by(Book.title)
-        .group_by(Book.id)
-
+        .switch(Book)
+        .where((Book.borrowed_by != user) | Book.borrowed_by.is_null())
+        .order_by(Book.title),
+        Book.authors.get_through_model(),
+        Author,
     )
-    # Keep only the books that are not already borrowed by the current user, because
-    # it does not make sense to show it in a list of borrowable books if the user already
-    # has it.
-    books_not_borrowed_by_current_user = [book for book in books if book.borrowed_by != user]
-    return {"books": books_not_borrowed_by_current_user, "user": user}
+    return {"books": list(books), "user": user}
 
 
 @route("/borrow_book/<book_id:int>")
@@ -126,26 +145,29 @@ def borrow_book(book_id):
     # the homepage. If not, they're redirected to the login page. See get_logged_in_user for
     # more details.
     user = get_logged_in_user()
-    try:
-        # Try to get the book from the ID provided in the URL (http://localhost/borrow_book/1 would
-        # mean we have to search for the book with ID 1)
-        # We could again be smart and do a complex join to get authors, but since it's a single book,
-        # the optimization won't give us a lot of benefits, and simplicity is better here
-        # SQL:
-        # SELECT id, title, publication_year, average_rating, ratings_count, image_url, borrowed_by_id, borrowed_at
-        # FROM book
-        # WHERE (id = 25)
-        book = Book.get(id=book_id)
-    except Book.DoesNotExist:
+    # Borrow the book (set the borrower and the date) with a single targeted
+    # UPDATE instead of fetching the whole row first and saving it back.
+    # The number of rows the UPDATE touched also tells us whether the book
+    # exists, so no separate SELECT is needed for that either.
+    # SQL:
+    # UPDATE book
+    # SET borrowed_by_id = 3, borrowed_at = '2021-06-01'
+    # WHERE (id = 25)
+    updated = (
+        Book
+        .update(borrowed_by=user, borrowed_at=datetime.date.today())
+        .where(Book.id == book_id)
+        .execute()
+    )
+    if not updated:
         # If the URL is wrong (example http://localhost/borrow_book/100 with no book with id 100
         # in the DB, we send the user to an error page.
         abort(404, "Book not found.")
-
-    # Set the user which is borrowing the book as the logged in user.
-    book.borrowed_by = user
-    # Set the date the book was borrowed.
-    book.borrowed_at = datetime.date.today()
-    book.save()
+    # Re-fetch only the fields the template actually shows (the title and the
+    # cover image), instead of dragging every column back to Python.
+    # SQL:
+    # SELECT title, image_url FROM book WHERE (id = 25)
+    book = Book.select(Book.title, Book.image_url).where(Book.id == book_id).get()
     # Provide the necessary info to the template (templates/borrow_book.tpl) so it can show
     # information about the book borrowed and in how many days he has to return it.
     return {"user": user, "book": book, "allowed_borrowed_days": str(ALLOWED_BORROW_DAYS)}
@@ -159,20 +181,22 @@ def return_book(book_id):
     (his home).
     """
     get_logged_in_user()
-    # Try to find the Book with the ID which is in the URL.
-    # If not found, send the user to an error page.
-    try:
-        # SELECT id, title, publication_year, average_rating, ratings_count, image_url, borrowed_by_id, borrowed_at
-        # FROM book
-        # WHERE (id = 25)
-        book = Book.get(id=book_id)
-    except Book.DoesNotExist:
-        abort(404, "Book not found.")
     # The book was returned. Remove information about the last borrower
-    # and the date it was borrowed.
-    book.borrowed_by = None
-    book.borrowed_at = None
-    book.save()
+    # and the date it was borrowed. One targeted UPDATE does both, and its
+    # affected-row count tells us if a Book with this ID exists at all, so
+    # the SELECT that used to precede the save() is not needed anymore.
+    # SQL:
+    # UPDATE book
+    # SET borrowed_by_id = NULL, borrowed_at = NULL
+    # WHERE (id = 25)
+    updated = (
+        Book
+        .update(borrowed_by=None, borrowed_at=None)
+        .where(Book.id == book_id)
+        .execute()
+    )
+    if not updated:
+        abort(404, "Book not found.")
     # Redirect to home, and since this page was accessed from a button on a book in the home,
     # it means it reloads the home with one book less in the list of borrowed books.
     redirect("/home")
@@ -182,18 +206,20 @@ def return_book(book_id):
 @route("/logout")
 def logout():
     """
-    Logout of the page. Just set the user a logged_in = False
-    and redirect him to the login page since we don't have any
-    public homepage.
+    Logout of the page. Delete the session cookie, set the user a
+    logged_in = False and redirect him to the login page since we
+    don't have any public homepage.
     """
     user = get_logged_in_user()
-    # Set the user as logged out
-    user.logged_in = False
+    # The session cookie is what actually logs the user in, so remove it.
+    response.delete_cookie("session")
+    # Set the user as logged out. Update only the logged_in column instead of
+    # writing the whole row back with user.save().
     # SQL:
     # UPDATE user
     # SET logged_in = 0
     # WHERE ID = 25
-    user.save()
+    User.update(logged_in=False).where(User.id == user.id).execute()
     redirect("/login")
 
 
@@ -243,7 +269,10 @@ def register():
     If all the tests pass, we create the User in our Database, set him as logged in and redirect him
     to his homepage.
     """
-    # request.forms.get("email") is what we get from the email input in the templates/register.tpl
+    # request.forms.decode() gives us all the submitted form fields as one
+    # plain dictionary. Reading it once is cheaper than going through bottle's
+    # MultiDict (which decodes each value on access) once per field.
+    # form_fields.get("email") is what we get from the email input in the templates/register.tpl
     # This input is defined like this:
     # <input name="email" value="{{email}}" type="email" class="form-control" id="email" aria-describedby="emailHelp" placeholder="Email">
     # The important part is value="{{email}}", which means whatever we return to the template in this function
@@ -251,11 +280,12 @@ def register():
     # So let's say the user enters an incorrect email and lands on this page.
     # We will check that the email is invalid, and return the entered email to the template.
     # That way, each time the user fails to register, the form has still the information he provided and is not empty.
+    form_fields = request.forms.decode()
     form_data = {
-        "email": request.forms.get("email", default=""),
-        "password": request.forms.get("password", default=""),
-        "first_name": request.forms.get("first_name", default=""),
-        "last_name": request.forms.get("last_name", default=""),
+        "email": form_fields.get("email", ""),
+        "password": form_fields.get("password", ""),
+        "first_name": form_fields.get("first_name", ""),
+        "last_name": form_fields.get("last_name", ""),
         "error": ""
     }
     # Check if all the fields were provided
@@ -278,12 +308,17 @@ def register():
         # User.email in models.py as : "email = CharField(unique=True)"
         # In SQL this would be
         # INSERT INTO user (first_name, last_name, email, password)
-        # VALUES(Bob, Marley, kayanow@kaya.kaya, theWailersRule)
+        # VALUES(Bob, Marley, kayanow@kaya.kaya, $2b$12$...)
+        # The password is never stored in clear. bcrypt.hashpw produces a salted
+        # hash that bcrypt.checkpw can verify at login time.
+        # See https://culttt.com/2013/01/21/why-do-you-need-to-salt-and-hash-passwords/
         user = User.create(
             first_name=form_data["first_name"],
             last_name=form_data["last_name"],
             email=form_data["email"],
-            password=form_data["password"]
+            password=bcrypt.hashpw(
+                form_data["password"].encode("utf-8"), bcrypt.gensalt()
+            ).decode("utf-8")
         )
     except IntegrityError:
         form_data["error"] = "User with email %s already registered. Please <a href='login'/>login</a> instead" % (form_data["email"])
@@ -336,10 +371,13 @@ def login():
     If it can't, it reloads the login page with an error message.
     """
     # The data entered by the User is the one we provide back to the template templates/login.tpl
-    # with potentially an error message
+    # with potentially an error message.
+    # As in register(), decode the submitted form once instead of going
+    # through bottle's MultiDict for every field.
+    form_fields = request.forms.decode()
     form_data = {
-        "email": request.forms.get('email', default=""),
-        "password": request.forms.get('password', default=""),
+        "email": form_fields.get("email", ""),
+        "password": form_fields.get("password", ""),
         "error": ""
     }
     if not form_data["email"]:
@@ -350,23 +388,42 @@ def login():
         form_data["error"] = "Please enter a password."
         return form_data
 
-    try:
-        # Try to find the User
-        # SQL: SELECT id, email, first_name, last_name, password, logged_in, last_seen, is_admin
-        # FROM user
-        # WHERE ((email = bob.marley@wailers.com) AND (password = kayaNow))
-        user = User.get(User.email==form_data["email"], User.password == form_data["password"])
-
-        # The user is found, set him as logged in (some fields updated on the Database + encrypted cookie)
-        # and redirect him to his home.
-        set_logged_in_user(user)
-        redirect("/home")
-        return True
-    except User.DoesNotExist:
-        # The user does not exist. reload the same page with an error message.
+    # Try to find the User by email only. The email column is unique, so it
+    # is indexed and this is a single index lookup. The password is a bcrypt
+    # hash, so it cannot be compared in SQL anyway: bcrypt.checkpw verifies
+    # the entered password against the stored hash in Python.
+    # get_or_none returns None for an unknown email instead of raising
+    # DoesNotExist, so the common failed-login case does not pay for building
+    # and unwinding an exception.
+    # SQL: SELECT id, email, first_name, last_name, password, logged_in, last_seen, is_admin
+    # FROM user
+    # WHERE (email = bob.marley@wailers.com)
+    user = User.get_or_none(User.email == form_data["email"])
+    password_matches = False
+    if user is not None:
+        try:
+            password_matches = bcrypt.checkpw(
+                form_data["password"].encode("utf-8"),
+                user.password.encode("utf-8"),
+            )
+        except ValueError:
+            # The stored value is not a valid bcrypt hash: this user row was
+            # created before passwords were hashed (recreate the database with
+            # "python models.py" to fix the seeded users). Treat it as a
+            # failed login instead of crashing with a 500.
+            pass
+    if not password_matches:
+        # Same error message whether the email or the password was wrong, so
+        # that an attacker cannot tell which of the two it was.
         form_data["error"] = "Bad email/password. Please try again or Register."
         return form_data
 
+    # The user is found, set him as logged in (some fields updated on the Database + signed cookie)
+    # and redirect him to his home.
+    set_logged_in_user(user)
+    redirect("/home")
+    return True
+
 
 @get("/static/<filepath:re:.*\.(jpg|png|gif|ico|svg)>")
 def img(filepath):
@@ -374,81 +431,203 @@ def img(filepath):
     This is the recommended way to serve static files (images, documents, etc) by bottle.
 
     See https://stackoverflow.com/questions/10486224/bottle-static-files
+
+    In production it is better to let a reverse proxy (nginx, Caddy) serve
+    /static directly (see the Deployment section of the README); this handler
+    is the fallback. Either way the images never change, so browsers are told
+    to cache them for a year and never ask again.
     """
-    return static_file(filepath, root="static")
+    static_response = static_file(filepath, root="static")
+    # static_file returns an HTTPError for a missing or unreadable file; that
+    # must not get the long cache header, or browsers and proxies would keep
+    # serving the 404 for a year even after the file (re)appears.
+    if not isinstance(static_response, HTTPError):
+        static_response.set_header(
+            "Cache-Control", "public, max-age=31536000, immutable"
+        )
+    return static_response
 
 
 def set_logged_in_user(user):
     """
     When a User logs in or registers, make him logged in.
 
-    1/ Set an encrypted cookie with the user's email and the password.
+    1/ Set a signed session cookie containing the user's ID.
        It will help check if he is logged in.
     2/ Update some values on the User in the Database (logged_in, last_seen)
     """
-    response.set_cookie("user-email", user.email, secret=SECRET_KEY)
-    response.set_cookie("password", user.password, secret=SECRET_KEY)
+    # The token is the user's ID, signed with SECRET_KEY and timestamped, so it
+    # cannot be forged or replayed forever. Unlike the previous scheme, the
+    # password never leaves the server.
+    response.set_cookie("session", session_serializer.dumps(user.id))
+    # Update the two columns directly instead of saving the whole row.
     user.logged_in = True
-    user.last_seen = time.time()
-    user.save()
+    user.last_seen = int(time.time())
+    (
+        User
+        .update(logged_in=True, last_seen=user.last_seen)
+        .where(User.id == user.id)
+        .execute()
+    )
 
 def get_logged_in_user():
     """
     This function needs to be called by any route that needs to be private
     (only accessible to a logged in User).
 
-    It tries to match the information stored in an encrypted cookie
-    (see the log_in function) with a User in the Database.
+    It verifies the signed session cookie (see set_logged_in_user) and
+    fetches the matching User from the Database.
 
     The conditions are:
-    - The email stored in the cookie must match
-    - The password stored in the cookie must match
-    - The User must have been logged in in the past hour (3600 seconds)
+    - The signature of the session cookie must be valid
+    - The cookie must have been issued in the past hour (3600 seconds)
+    - A User with the ID stored in the cookie must exist
 
     If the conditions are met, we update the last time the user
     was seen logged in, and return the user.
 
     If they are not met, the user is redirected to the login page.
     """
-
-    # Get the user email and the password stored in the cookie
-    # They are encrypted by SECRET_KEY. Right now, SECRET_KEY is available
-    # in constants.py, which means that it is not very safe. Normally SECRET_KEY
-    # should be protected so that malicious users cannot read the cookie.
-    user_email = request.get_cookie("user-email", secret=SECRET_KEY)
-    password = request.get_cookie("password", secret=SECRET_KEY)
+    # If this function was already called while serving the current request,
+    # reuse its result instead of querying the database again. Bottle stores
+    # custom attributes of the request object in the request environment, so
+    # the cached user lives exactly as long as one request.
+    # See https://bottlepy.org/docs/dev/api.html#bottle.BaseRequest
+    if hasattr(request, "logged_in_user"):
+        return request.logged_in_user
+
+    # Get the session token from the cookie. It is signed with SECRET_KEY.
+    # Right now, SECRET_KEY is available in constants.py, which means that it
+    # is not very safe. Normally SECRET_KEY should be protected so that
+    # malicious users cannot forge a token.
+    token = request.get_cookie("session")
     try:
-        # Try to see if the information in the cookie matches a User in the
-        # Database which has been connected in the past hour.
-        # SQL:
-        # SELECT id, email, first_name, last_name, password, logged_in, last_seen, is_admin
-        # FROM user
-        # WHERE (
-        #   (email = bob@bob.bob)
-        #   AND (password = "fdasfdsfadf")
-        #   AND (logged_in = 1)
-        #   AND (12344567 - last_seen) < 3600)
-        # )
-        user = User.get(
-            User.email == user_email,
-            User.password == password,
-            User.logged_in == True,
-            time.time() - User.last_seen < 3600
-        )
-        # Update time last seen and return the connected User.
-        user.last_seen = time.time()
-        user.save()
-        return user
-    except User.DoesNotExist:
+        # Check the signature and the age of the token in Python. This replaces
+        # the old multi-predicate query on email/password/logged_in/last_seen:
+        # no query at all happens for a missing, forged or expired cookie.
+        user_id = session_serializer.loads(token or "", max_age=3600)
+    except BadSignature:
         # The user has never logged in, or has logged out,
-        # or has been inactive on the site for more than an hour.
+        # or the token is older than an hour, or has been tampered with.
         redirect("/login")
+    # The token is valid, fetch the user it belongs to. This is a single
+    # lookup by primary key. get_or_none spares the exception machinery of
+    # catching DoesNotExist for stale tokens.
+    # Only the ID (which the borrowed_books backref and the targeted UPDATEs
+    # key on) and last_seen (for the throttling below) are ever used by the
+    # routes and templates, so don't pull the name, email and password hash
+    # out of the database on every single request.
+    # SQL:
+    # SELECT id, last_seen
+    # FROM user
+    # WHERE (id = 25)
+    user = (
+        User
+        .select(User.id, User.last_seen)
+        .where(User.id == user_id)
+        .get_or_none()
+    )
+    if user is None:
+        # The token is valid but the user it points to is gone
+        # (e.g. the database was reseeded).
+        redirect("/login")
+    # Update the time the user was last seen, but only if the stored value
+    # is more than 30 seconds old. Writing it on every single page load
+    # would mean one UPDATE (and one commit to disk) per request, for a
+    # value that only needs to be precise to the hour.
+    now = int(time.time())
+    if now - (user.last_seen or 0) > 30:
+        User.update(last_seen=now).where(User.id == user.id).execute()
+        user.last_seen = now
+    # Cache the user for the rest of this request (see the top of this
+    # function) and return it.
+    request.logged_in_user = user
+    return user
+
+def optimize_database():
+    """
+    Let SQLite refresh its query planner statistics when the server stops.
+
+    PRAGMA optimize is cheap: it only re-runs ANALYZE for the tables whose
+    content changed enough since the last run to make the stored statistics
+    stale (the initial statistics are collected by "python models.py").
+    See https://www.sqlite.org/pragma.html#pragma_optimize
+    """
+    db.connect(reuse_if_open=True)
+    db.execute_sql("PRAGMA optimize")
+    db.close()
 
-# Run the service.
-# The host is localhost, so it runs on the local machine, and the website
-# will be available at http://localhost
-# The port is 8081, so actually the full URL is http://localhost:8081
-# reloader=True allows you, when you are running "python server.py",
-# to change the code in "server.py", refresh the web page, and see the changes
-# you made in your code. This is very helpful for developing.
-run(host='localhost', port=8081, reloader=True, debug=True)
\ No newline at end of file
+
+# Run optimize_database when the server process exits.
+atexit.register(optimize_database)
+
+
+def preload_templates():
+    """
+    Compile all the page templates once, at startup.
+
+    Bottle normally reads and compiles a .tpl file the first time it is
+    rendered and keeps it in its TEMPLATES cache. By filling that cache
+    here, no request ever pays the price of reading and compiling a
+    template, not even the first one after a (re)start.
+
+    Note that bottle ignores its template cache when DEBUG is on, so this
+    only helps when the app runs with debugging disabled (the normal case,
+    see the run() call below).
+    """
+    for page in ("home", "borrow_books", "borrow_book", "register", "login"):
+        tpl_name = "templates/%s" % page
+        template = SimpleTemplate(name=tpl_name, lookup=TEMPLATE_PATH)
+        # Accessing the "co" property is what makes bottle compile the
+        # template's code object.
+        template.co
+        # This is the same cache key bottle's template() function computes,
+        # so the @view decorators above will find the precompiled templates.
+        TEMPLATES[(id(TEMPLATE_PATH), tpl_name)] = template
+        # The partial templates (base.tpl, book.tpl, ...) are compiled and
+        # cached per parent template on the first render that includes them.
+
+
+preload_templates()
+
+# The WSGI entry point for production servers. Bottle registered all the
+# @route functions above on its default application, and a WSGI server can
+# serve it with several workers/threads in parallel, for example:
+# gunicorn -w 4 -k gthread --threads 8 server:application
+# The built-in development server below is single-threaded and should not be
+# used in production.
+application = default_app()
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    """
+    A wsgiref server that handles each request in its own thread.
+
+    The standard wsgiref server processes one request at a time, so a slow
+    request (or just a slow client) blocks everyone else. Handling requests
+    in threads lets them overlap: peewee opens one SQLite connection per
+    thread, and the WAL journal mode set in models.py allows those readers
+    to proceed while a write is committing.
+    """
+    daemon_threads = True
+
+
+# This if is True only if this code is executed by calling "python server.py".
+# A WSGI server importing this module must not start the development server
+# on top of its own, which is why the run() call is guarded (same pattern as
+# in models.py).
+if __name__ == '__main__':
+    # Run the development service.
+    # The host is localhost, so it runs on the local machine, and the website
+    # will be available at http://localhost
+    # The port is 8081, so actually the full URL is http://localhost:8081
+    # reloader=True allows you, when you are running "python server.py",
+    # to change the code in "server.py", refresh the web page, and see the changes
+    # you made in your code. This is very helpful for developing.
+    # debug stays off so that bottle uses its template cache (see
+    # preload_templates above); the reloader restarts the process on code
+    # changes anyway, which recompiles the templates too.
+    # server_class makes bottle's wsgiref server handle requests concurrently
+    # (see ThreadingWSGIServer above). Production deployments should still use
+    # a real WSGI server (see the Deployment section of the README).
+    run(host='localhost', port=8081, reloader=True, debug=False,
+        server_class=ThreadingWSGIServer)
\ No newline at end of file
@@ -5,6 +5,7 @@
 
     <div class="d-flex flex-row flex-wrap bd-highlight">
         % for book in books:
+            % book.author_list = ", ".join([author.name for author in book.authors])
             % include("templates/book.tpl", book=book, card_type="to_borrow")
         % end
     </div>